@@ -1,93 +1,106 @@
 # app.py
 
+import matplotlib
+matplotlib.use('Agg')  # Figures are only rasterized for st.pyplot, so skip any GUI backend init
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 import warnings
-from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, JsCode
+from datetime import date
 
 from real_time import RealTimeFinancialDashboard
+from dashboard_ui import get_dashboard
 
 warnings.filterwarnings("ignore")
 
+_METRIC_COLUMN = st.column_config.TextColumn("Metric", width="large")
+_VALUE_COLUMN = st.column_config.NumberColumn(format="%,.2f")
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _fetch(symbol: str, day: str):
+    """Fetches screener data for a symbol, kept in memory for the calendar ``day``.
+
+    Restarts are covered by the backend's pruned on-disk cache; the quote fields in it go stale within
+    the day and are overlaid from ``_fetch_quote`` when shown.
+    """
+    return get_dashboard(RealTimeFinancialDashboard).get_screener_data(symbol)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_quote(symbol: str):
+    """Fetches just the price and metric fields for a symbol, refreshed every five minutes."""
+    return get_dashboard(RealTimeFinancialDashboard).get_quote(symbol)
+
+@st.cache_resource(ttl=900, show_spinner=False)
+def _comprehensive_fig(symbol: str):
+    """Builds the four-panel summary Figure once per symbol; Figures are cached unpickled."""
+    # The backend builds it outside pyplot's registry, so evicted entries are garbage collected
+    return get_dashboard(RealTimeFinancialDashboard).create_comprehensive_dashboard(symbol)
+
+def prepare_df(df, in_crores=True):
+    if df.empty: return None
+    values = df.to_numpy(dtype=np.float64)
+    if in_crores: values = values / 1e7
+    # The table only shows two decimals, so round rather than ship full float64 digits to the browser
+    values = np.round(values, 2)
+    # Build the Metric x year layout directly instead of transposing and renaming copies
+    df_t = pd.DataFrame(values.T, index=pd.Index(df.columns, name='Metric'), columns=df.index.to_numpy())
+    return df_t.reset_index()
+
+@st.cache_data(show_spinner=False)
+def _prepare_all(symbol: str, financials: dict):
+    """Builds the transposed statement and ratio tables once per symbol's financials."""
+    return (
+        prepare_df(financials['income_statement']),
+        prepare_df(financials['balance_sheet']),
+        prepare_df(financials['cash_flow']),
+        prepare_df(financials['ratios'], in_crores=False),
+    )
+
+@st.cache_data(show_spinner=False)
+def _csv_bytes(symbol: str, name: str, df: pd.DataFrame) -> bytes:
+    """Encodes a statement as CSV bytes once, instead of on every rerun that draws the export buttons."""
+    return df.to_csv().encode('utf-8')
+
 def create_interactive_financial_grid(df_transposed: pd.DataFrame, title: str, is_ratio: bool = False):
-    """Displays an interactive AgGrid table and a corresponding bar chart for a selected row."""
+    """Displays a selectable statement table and a corresponding bar chart for the selected row."""
     st.subheader(title)
 
-    gb = GridOptionsBuilder.from_dataframe(df_transposed)
-    gb.configure_selection('single', use_checkbox=True)
-    
-    cell_style_jscode = JsCode("function(params) { if (typeof params.value === 'number') { return { 'textAlign': 'right', 'fontFamily': 'monospace' }; } };")
-    gb.configure_column("Metric", headerName="Metric", flex=2, minWidth=250)
-    for col in df_transposed.columns[1:]:
-        gb.configure_column(
-            col, type=["numericColumn", "numberColumnFilter"],
-            valueFormatter="params.value == null ? '' : params.value.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2})",
-            cellStyle=cell_style_jscode, flex=1, minWidth=120
-        )
-    
-    grid_response = AgGrid(
-        df_transposed, gridOptions=gb.build(), update_mode=GridUpdateMode.SELECTION_CHANGED,
-        theme='streamlit', allow_unsafe_jscode=True, height=450, fit_columns_on_grid_load=True
+    column_config = {"Metric": _METRIC_COLUMN, **dict.fromkeys(df_transposed.columns[1:], _VALUE_COLUMN)}
+
+    event = st.dataframe(
+        df_transposed, hide_index=True, height=450, column_config=column_config,
+        on_select="rerun", selection_mode="single-row", key=f"grid::{title}"
     )
-    
-    selected_rows_df = grid_response['selected_rows']
-    
-    # Check if the returned object is a non-empty DataFrame or list
-    if isinstance(selected_rows_df, pd.DataFrame) and not selected_rows_df.empty:
-        selected_row_data = selected_rows_df.to_dict('records')[0]
-        
-        metric = selected_row_data.pop('Metric')
-        plot_data = pd.Series(selected_row_data).astype(float).sort_index()
 
-        st.subheader(f"📈 Chart: {metric} over Years")
-        fig, ax = plt.subplots(figsize=(12, 5))
-        
-        colors = ['#2ca02c' if val >= 0 else '#d62728' for val in plot_data]
-        plot_data.plot(kind='bar', ax=ax, color=colors, edgecolor='black', alpha=0.8)
-        
-        ax.set_ylabel("Value" if is_ratio else "Amount (in Cr)")
-        ax.set_xlabel("Year")
-        ax.tick_params(axis='x', rotation=45, labelsize=12)
-        ax.grid(axis='y', linestyle='--', alpha=0.6)
-        
-        for p in ax.patches:
-            ax.annotate(f'{p.get_height():,.2f}', (p.get_x() + p.get_width() / 2., p.get_height()),
-                        ha='center', va='center', fontsize=9, color='black', xytext=(0, 10),
-                        textcoords='offset points')
-        
-        plt.tight_layout()
-        st.pyplot(fig)
-    elif isinstance(selected_rows_df, list) and selected_rows_df:
-        # Handle case where selected_rows is a list
-        selected_row_data = selected_rows_df[0]
-        
-        metric = selected_row_data.pop('Metric')
-        plot_data = pd.Series(selected_row_data).astype(float).sort_index()
+    if event.selection.rows:
+        import altair as alt
+
+        selected_row = df_transposed.iloc[event.selection.rows[0]]
+
+        metric = selected_row['Metric']
+        years = df_transposed.columns[1:]
+        values = np.fromiter((selected_row[y] for y in years), dtype=np.float64, count=len(years))
+        chart_df = pd.DataFrame({'Year': years, 'Value': values})
 
         st.subheader(f"📈 Chart: {metric} over Years")
-        fig, ax = plt.subplots(figsize=(12, 5))
-        
-        colors = ['#2ca02c' if val >= 0 else '#d62728' for val in plot_data]
-        plot_data.plot(kind='bar', ax=ax, color=colors, edgecolor='black', alpha=0.8)
-        
-        ax.set_ylabel("Value" if is_ratio else "Amount (in Cr)")
-        ax.set_xlabel("Year")
-        ax.tick_params(axis='x', rotation=45, labelsize=12)
-        ax.grid(axis='y', linestyle='--', alpha=0.6)
-        
-        for p in ax.patches:
-            ax.annotate(f'{p.get_height():,.2f}', (p.get_x() + p.get_width() / 2., p.get_height()),
-                        ha='center', va='center', fontsize=9, color='black', xytext=(0, 10),
-                        textcoords='offset points')
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        base = alt.Chart(chart_df).encode(
+            x=alt.X('Year:O', title="Year", axis=alt.Axis(labelAngle=-45)),
+            y=alt.Y('Value:Q', title="Value" if is_ratio else "Amount (in Cr)")
+        )
+        bars = base.mark_bar(stroke='black', opacity=0.8).encode(
+            color=alt.condition(alt.datum.Value >= 0, alt.value('#2ca02c'), alt.value('#d62728')),
+            tooltip=['Year', alt.Tooltip('Value:Q', format=',.2f')]
+        )
+        labels = base.mark_text(dy=-8, fontSize=9, color='black').encode(text=alt.Text('Value:Q', format=',.2f'))
+        st.altair_chart(bars + labels, use_container_width=True)
 
-st.set_page_config(page_title="TIKR-Style Financial Dashboard", layout="wide", initial_sidebar_state="expanded")
+@st.fragment
+def _grid_tab(df_transposed: pd.DataFrame, title: str, is_ratio: bool = False):
+    """Renders a statement grid as a fragment so row selections rerun only its own tab."""
+    create_interactive_financial_grid(df_transposed, title, is_ratio=is_ratio)
 
-if 'dashboard' not in st.session_state:
-    st.session_state.dashboard = RealTimeFinancialDashboard()
+st.set_page_config(page_title="TIKR-Style Financial Dashboard", layout="wide", initial_sidebar_state="expanded")
 
 st.title("📈 Real-Time Financial Dashboard (TIKR Style)")
 
@@ -97,12 +110,15 @@ col1, col2 = st.sidebar.columns(2)
 run_dashboard = col1.button("Generate", use_container_width=True, type="primary")
 if col2.button("Clear", use_container_width=True):
     st.session_state.data = None
+    _fetch.clear()
+    _fetch_quote.clear()
+    _comprehensive_fig.clear()
     st.rerun()
 
 if run_dashboard and symbol_input:
     with st.spinner(f"Fetching and processing data for {symbol_input.upper()}..."):
         try:
-            data = st.session_state.dashboard.get_screener_data(symbol_input.upper())
+            data = _fetch(symbol_input.upper(), date.today().isoformat())
             if not data:
                 st.error(f"❌ Error for {symbol_input.upper()}: No data received. The symbol may be incorrect, delisted, or lack financial data on Yahoo Finance.")
                 st.session_state.data = None
@@ -113,7 +129,8 @@ if run_dashboard and symbol_input:
             st.session_state.data = None
 
 if 'data' in st.session_state and st.session_state.data:
-    data = st.session_state.data
+    # Day-cached statements with a current quote on top
+    data = {**st.session_state.data, **(_fetch_quote(st.session_state.data['symbol']) or {})}
     st.markdown(f"## {data['company_name']} ({data['symbol']})")
     price_delta_color = "normal" if data.get('change', 0) >= 0 else "inverse"
     metrics = data['real_time_metrics']
@@ -126,49 +143,38 @@ if 'data' in st.session_state and st.session_state.data:
     cols[4].metric("Dividend Yield", f"{data.get('dividend_yield', 0)*100:.2f}%")
     st.markdown("---")
 
-    def prepare_df(df_dict, in_crores=True):
-        df = pd.DataFrame(df_dict)
-        if df.empty: return None
-        df.set_index('years', inplace=True)
-        df_t = df.transpose()
-        if in_crores: df_t = df_t / 1e7
-        return df_t.reset_index().rename(columns={'index': 'Metric'})
-
-    df_income_t = prepare_df(data['financials']['income_statement'])
-    df_bs_t = prepare_df(data['financials']['balance_sheet'])
-    df_cf_t = prepare_df(data['financials']['cash_flow'])
-    df_ratios_t = prepare_df(data['financials']['ratios'], in_crores=False)
+    df_income_t, df_bs_t, df_cf_t, df_ratios_t = _prepare_all(data['symbol'], data['financials'])
         
     tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📊 Key Ratios", "💰 Income Statement", "📘 Balance Sheet", "💵 Cash Flow", "📈 Charts", "🧾 Summary"])
 
     with tab1:
         if df_ratios_t is not None: 
-            create_interactive_financial_grid(df_ratios_t, "Key Financial Ratios", is_ratio=True)
+            _grid_tab(df_ratios_t, "Key Financial Ratios", is_ratio=True)
         else: 
             st.warning("Key ratio data is not available.")
     
     with tab2:
         if df_income_t is not None: 
-            create_interactive_financial_grid(df_income_t, "Annual Income Statement")
+            _grid_tab(df_income_t, "Annual Income Statement")
         else: 
             st.warning("Income statement data is not available.")
     
     with tab3:
         if df_bs_t is not None: 
-            create_interactive_financial_grid(df_bs_t, "Annual Balance Sheet")
+            _grid_tab(df_bs_t, "Annual Balance Sheet")
         else: 
             st.warning("Balance sheet data is not available.")
     
     with tab4:
         if df_cf_t is not None: 
-            create_interactive_financial_grid(df_cf_t, "Annual Cash Flow Statement")
+            _grid_tab(df_cf_t, "Annual Cash Flow Statement")
         else: 
             st.warning("Cash flow data is not available.")
     
     with tab5:
         st.subheader("📈 Financial Summary Charts")
         try:
-            fig = st.session_state.dashboard.create_comprehensive_dashboard(data['symbol'])
+            fig = _comprehensive_fig(data['symbol'])
             if fig: 
                 st.pyplot(fig)
             else: 
@@ -190,13 +196,10 @@ if 'data' in st.session_state and st.session_state.data:
         col4.metric("52-Week Low", f"₹{metrics.get('fifty_two_week_low', 0):.2f}")
     
     with st.expander("📥 Export Raw Data to CSV"):
-        def to_csv(df_dict): 
-            return pd.DataFrame(df_dict).to_csv(index=False).encode('utf-8')
-        
-        st.download_button("Download Income Statement", to_csv(data['financials']['income_statement']), f"{data['symbol']}_Income.csv", "text/csv")
-        st.download_button("Download Balance Sheet", to_csv(data['financials']['balance_sheet']), f"{data['symbol']}_BalanceSheet.csv", "text/csv")
-        st.download_button("Download Cash Flow", to_csv(data['financials']['cash_flow']), f"{data['symbol']}_CashFlow.csv", "text/csv")
-        st.download_button("Download Ratios", to_csv(data['financials']['ratios']), f"{data['symbol']}_Ratios.csv", "text/csv")
+        st.download_button("Download Income Statement", _csv_bytes(data['symbol'], 'income', data['financials']['income_statement']), f"{data['symbol']}_Income.csv", "text/csv")
+        st.download_button("Download Balance Sheet", _csv_bytes(data['symbol'], 'balance_sheet', data['financials']['balance_sheet']), f"{data['symbol']}_BalanceSheet.csv", "text/csv")
+        st.download_button("Download Cash Flow", _csv_bytes(data['symbol'], 'cash_flow', data['financials']['cash_flow']), f"{data['symbol']}_CashFlow.csv", "text/csv")
+        st.download_button("Download Ratios", _csv_bytes(data['symbol'], 'ratios', data['financials']['ratios']), f"{data['symbol']}_Ratios.csv", "text/csv")
 else:
     st.info("👋 Welcome! Enter a valid NSE stock symbol and click 'Generate' to begin.")
 
@@ -0,0 +1,19 @@
+# dashboard_ui.py
+
+import streamlit as st
+from matplotlib.figure import Figure
+
+@st.cache_resource
+def get_dashboard(backend: type):
+    """Returns an instance of the ``backend`` dashboard class, created once per class and shared across all sessions."""
+    return backend()
+
+def chart_axes(key: str, figsize: tuple):
+    """Returns this session's Figure and Axes for a chart slot, cleared for redrawing instead of rebuilt per click."""
+    if key not in st.session_state:
+        # Kept out of pyplot's global registry, so it is freed along with the session
+        fig = Figure(figsize=figsize)
+        st.session_state[key] = fig, fig.subplots()
+    fig, ax = st.session_state[key]
+    ax.clear()
+    return fig, ax
@@ -1,11 +1,146 @@
 # real_time.py
 
+from __future__ import annotations
+
 import yfinance as yf
+from yfinance.data import YfData
+from yfinance.exceptions import YFException
+try:
+    # Drop-in persistent cache over yfinance; plain yfinance is used when it isn't installed
+    import yfinance_cache as yfc
+except ImportError:
+    yfc = None
+import time
+import orjson
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import lru_cache
+from joblib import Memory
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+# On-disk memoization of raw Yahoo Finance responses, bucketed by calendar day
+_memory = Memory(location=".tikr_cache", verbose=0)
+
+# Symbols fetched at once by get_screener_data_batch; kept low so a watchlist doesn't trip Yahoo's rate limit
+_BATCH_WORKERS = 4
+
+# Statement line items feeding the ratios, in the order they are unpacked in get_screener_data
+_INCOME_ITEMS = ['Net Income', 'Total Revenue']
+_BALANCE_ITEMS = ['Total Stockholder Equity', 'Total Assets', 'Total Current Assets', 'Total Current Liabilities', 'Total Liab']
+
+# Width of the time buckets keying the in-memory screener cache
+_CACHE_BUCKET_SECONDS = 60
+
+# Width of the time buckets keying the on-disk quote cache; statements are bucketed by day
+_QUOTE_BUCKET_SECONDS = 300
+
+# Entries unused for a day are stale by construction (quotes by bucket, statements by date), so they are pruned
+_CACHE_AGE_LIMIT = timedelta(days=1)
+_CACHE_BYTES_LIMIT = "200M"
+
+# Only the quoteSummary modules holding the info keys read below, instead of the full stock.info bundle
+_QUOTE_SUMMARY_URL = "https://query2.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
+_QUOTE_SUMMARY_MODULES = "price,summaryDetail,defaultKeyStatistics,financialData"
+
+def _quote_summary_info(symbol: str) -> Dict[str, Any]:
+    """Fetches the used quoteSummary modules and flattens them into a stock.info-shaped dict of raw values."""
+    # Sent through yfinance's shared client, which attaches the cookie and crumb Yahoo requires
+    resp = YfData().get(
+        _QUOTE_SUMMARY_URL.format(symbol=symbol),
+        params={"modules": _QUOTE_SUMMARY_MODULES, "formatted": "false"},
+        timeout=10,
+    )
+    resp.raise_for_status()
+    result = orjson.loads(resp.content)["quoteSummary"]["result"][0]
+    info = {}
+    for module in result.values():
+        for key, value in module.items():
+            if isinstance(value, dict):
+                value = value.get("raw")
+            # Like stock.info, leave out fields Yahoo sends back empty rather than storing None
+            if value is not None:
+                info.setdefault(key, value)
+    return info
+
+def _fetch_info(symbol: str, stock) -> Dict[str, Any]:
+    """Returns the quote info for a symbol, falling back to stock.info if the direct request is refused."""
+    try:
+        return _quote_summary_info(symbol)
+    # Refused, throttled or malformed responses: the HTTP clients' errors are OSErrors, orjson's a ValueError
+    except (OSError, YFException, ValueError, KeyError, IndexError, TypeError):
+        return stock.info
+
+@_memory.cache(ignore=['stock'])
+def _fetch_statements(symbol: str, day: date, stock) -> Dict[str, Any]:
+    """Downloads the annual statements for a symbol; cached on disk for the given day."""
+    # The three downloads are independent network calls, so issue them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            name: executor.submit(getattr, stock, name)
+            for name in ("financials", "balance_sheet", "cashflow")
+        }
+    return {name: future.result() for name, future in futures.items()}
+
+def _cached_statements(symbol: str, day: date, stock) -> Dict[str, Any]:
+    """Returns the day's statements for a symbol, keeping them on disk only if at least one came back."""
+    shelved = _fetch_statements.call_and_shelve(symbol, day, stock)
+    statements = shelved.get()
+    # yfinance reports failures and throttling as empty frames rather than raising; don't serve those all day
+    if all(df.empty for df in statements.values()):
+        shelved.clear()
+    return statements
+
+@_memory.cache(ignore=['stock'])
+def _fetch_quote(symbol: str, bucket: int, stock) -> Dict[str, Any]:
+    """Downloads the quote info for a symbol; cached on disk for the given time bucket."""
+    return _fetch_info(symbol, stock)
+
+@lru_cache(maxsize=1)
+def _prune_disk_cache(hour: int) -> None:
+    """Evicts old and excess entries from the disk cache; keyed by ``hour`` so it walks the cache at most hourly."""
+    _memory.reduce_size(bytes_limit=_CACHE_BYTES_LIMIT, age_limit=_CACHE_AGE_LIMIT)
+
+def _fetch_raw(symbol: str, day: date, stock=None) -> Dict[str, Any]:
+    """Returns info and annual statements for a symbol, each served from its own disk cache when fresh."""
+    if stock is None:
+        stock = (yfc or yf).Ticker(symbol)
+    _prune_disk_cache(int(time.time()) // 3600)
+    # Statements only change with new filings, but the quote moves intraday, so it expires much sooner
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        quote = executor.submit(_fetch_quote, symbol, int(time.time()) // _QUOTE_BUCKET_SECONDS, stock)
+        statements = executor.submit(_cached_statements, symbol, day, stock)
+    return {"info": quote.result(), **statements.result()}
+
+def _safe_div(numerator: np.ndarray, denominator: np.ndarray, fill: float = np.nan) -> np.ndarray:
+    """Divides element-wise, returning ``fill`` wherever the denominator is zero."""
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, fill, dtype=np.float64), where=(denominator != 0))
+
+def _zero_filled(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns a float64 copy of the frame with NaNs replaced by 0, filled in a single numpy pass."""
+    values = np.nan_to_num(df.to_numpy(dtype=np.float64), nan=0.0)
+    return pd.DataFrame(values, index=df.index, columns=df.columns)
+
+def _by_year(statement: pd.DataFrame) -> pd.DataFrame:
+    """Turns a yfinance statement (line items x report dates) into one row per year, indexed by ascending 'years'."""
+    # Built from one float64 block rather than transposing yfinance's (often object-dtype) frame
+    values = statement.to_numpy(dtype=np.float64, na_value=np.nan).T
+    years = pd.Index(pd.to_datetime(statement.columns).strftime('%Y'), name='years')
+    return pd.DataFrame(values, index=years, columns=statement.index).sort_index()
+
+def _df_default(obj: Any) -> Any:
+    """orjson fallback that encodes a DataFrame in split orient: its index, columns and a C-contiguous value matrix."""
+    if isinstance(obj, pd.DataFrame):
+        return {
+            "index": obj.index.tolist(),
+            "columns": obj.columns.tolist(),
+            "data": np.ascontiguousarray(obj.to_numpy(dtype=np.float64)),
+        }
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 class RealTimeFinancialDashboard:
     """
@@ -13,182 +148,230 @@ class RealTimeFinancialDashboard:
     using the yfinance library.
     """
 
-    def __init__(self):
-        """Initializes the dashboard class and sets a professional plot style."""
-        sns.set_style("whitegrid")
-        plt.rcParams.update({
-            'figure.figsize': (12, 6), 'axes.titlesize': 16, 'axes.labelsize': 12,
-            'xtick.labelsize': 10, 'ytick.labelsize': 10, 'legend.fontsize': 10
-        })
-
-    def _safe_division(self, numerator: pd.Series, denominator: pd.Series) -> pd.Series:
-        """Performs division safely, returning np.nan where the denominator is zero or has different index."""
-        # Ensure both inputs are pandas Series
-        if not isinstance(numerator, pd.Series):
-            numerator = pd.Series(numerator)
-        if not isinstance(denominator, pd.Series):
-            denominator = pd.Series(denominator)
-            
-        # Align indexes to prevent mismatch errors, fill missing values with 0
-        num_aligned, den_aligned = numerator.align(denominator, fill_value=0)
-        # Replace 0 in the denominator with NaN to avoid division errors
-        den_aligned = den_aligned.replace(0, np.nan)
-        return num_aligned / den_aligned
-
-    def get_screener_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Fetches comprehensive financial data for a given NSE stock symbol."""
+    # The plot style is process-global, so it only needs applying before the first chart
+    _style_configured = False
+
+    @classmethod
+    def _configure_style(cls):
+        """Sets a professional plot style once per process, importing the plotting stack on first use."""
+        if not cls._style_configured:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
+            sns.set_style("whitegrid")
+            plt.rcParams.update({
+                'figure.figsize': (12, 6), 'axes.titlesize': 16, 'axes.labelsize': 12,
+                'xtick.labelsize': 10, 'ytick.labelsize': 10, 'legend.fontsize': 10
+            })
+            cls._style_configured = True
+
+    @staticmethod
+    def _to_nse_symbol(symbol: str) -> str:
+        """Upper-cases a symbol and appends the NSE suffix if it is missing."""
         stock_symbol = symbol.upper()
         if not stock_symbol.endswith('.NS'):
             stock_symbol += '.NS'
+        return stock_symbol
 
-        stock = yf.Ticker(stock_symbol)
-        info = stock.info
-        
-        if not info or ('regularMarketPrice' not in info and 'currentPrice' not in info):
+    def get_screener_data_batch(self, symbols: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetches screener data for many NSE symbols concurrently, keyed by their ".NS" symbol."""
+        stock_symbols = list(dict.fromkeys(self._to_nse_symbol(s) for s in symbols))
+        # Each symbol is its own set of Yahoo requests, so overlap them instead of waiting on each in turn
+        with ThreadPoolExecutor(max_workers=_BATCH_WORKERS) as executor:
+            return dict(zip(stock_symbols, executor.map(self.get_screener_data, stock_symbols)))
+
+    def get_screener_data(self, symbol: str, stock: Optional[yf.Ticker] = None) -> Optional[Dict[str, Any]]:
+        """Fetches comprehensive financial data for a given NSE stock symbol, optionally through an existing Ticker.
+
+        Repeat calls for a symbol within the same minute are served from memory, as copies callers may mutate.
+        Returns None when Yahoo has no price or statements for the symbol; download errors are raised.
+        """
+        stock_symbol = self._to_nse_symbol(symbol)
+        if stock is not None:
+            return self._compute_screener_data(stock_symbol, stock)
+        return _detached(_screener_data_cached(stock_symbol, int(time.time()) // _CACHE_BUCKET_SECONDS))
+
+    def get_screener_data_json(self, symbol: str) -> bytes:
+        """Returns the screener data for a symbol as JSON bytes, encoding the statement frames straight from numpy."""
+        return orjson.dumps(self.get_screener_data(symbol), default=_df_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    @classmethod
+    def _compute_screener_data(cls, stock_symbol: str, stock: Optional[yf.Ticker] = None) -> Optional[Dict[str, Any]]:
+        """Builds the screener data dict for an already-normalized NSE symbol."""
+        # Network, throttling and cache errors propagate so callers can report them; None means no usable data
+        raw = _fetch_raw(stock_symbol, date.today(), stock)
+        quote = cls._quote_fields(stock_symbol, raw['info'])
+        if quote is None:
             return None
 
         try:
-            income_statement = stock.financials.transpose().reset_index()
-            balance_sheet = stock.balance_sheet.transpose().reset_index()
-            cash_flow = stock.cashflow.transpose().reset_index()
+            income_statement = _by_year(raw['financials'])
+            balance_sheet = _by_year(raw['balance_sheet'])
+            cash_flow = _by_year(raw['cashflow'])
             if income_statement.empty or balance_sheet.empty:
                 return None
         except Exception:
             return None
-            
-        for df in [income_statement, balance_sheet, cash_flow]:
-            df.rename(columns={'index': 'years'}, inplace=True)
-            if 'years' in df.columns:
-                df['years'] = pd.to_datetime(df['years']).dt.strftime('%Y')
-
-        # Helper function to safely get a column as a Series
-        def get_series(df: pd.DataFrame, col_name: str) -> pd.Series:
-            """Returns the column as a Series, or a Series of zeros if the column is missing."""
-            if col_name in df.columns:
-                # Set index to 'years' for proper alignment in division
-                series = df.set_index('years')[col_name].fillna(0)
-                return series
-            else:
-                # Return a series of zeros with the correct index
-                years_index = df['years'].tolist()
-                return pd.Series(0, index=years_index, name=col_name)
-
-        ratios = pd.DataFrame({'years': income_statement['years']})
-        
-        # Use the robust get_series helper for all calculations
-        net_income = get_series(income_statement, 'Net Income')
-        total_revenue = get_series(income_statement, 'Total Revenue')
-        stockholder_equity = get_series(balance_sheet, 'Total Stockholder Equity')
-        total_assets = get_series(balance_sheet, 'Total Assets')
-        current_assets = get_series(balance_sheet, 'Total Current Assets')
-        current_liabilities = get_series(balance_sheet, 'Total Current Liabilities')
-        total_liabilities = get_series(balance_sheet, 'Total Liab')
-        
-        ratios['Net Profit Margin'] = self._safe_division(net_income, total_revenue)
-        ratios['Return on Equity (ROE)'] = self._safe_division(net_income, stockholder_equity)
-        ratios['Return on Assets (ROA)'] = self._safe_division(net_income, total_assets)
-        ratios['Current Ratio'] = self._safe_division(current_assets, current_liabilities)
-        ratios['Debt to Equity'] = self._safe_division(total_liabilities, stockholder_equity)
+
+        # One reindex per statement picks out the ratio inputs, with the balance sheet aligned on the income
+        # statement's years; missing line items come back as NaN and end up as 0 ratios
+        net_income, total_revenue = income_statement.reindex(columns=_INCOME_ITEMS).to_numpy(dtype=np.float64).T
+        stockholder_equity, total_assets, current_assets, current_liabilities, total_liabilities = (
+            balance_sheet.reindex(index=income_statement.index, columns=_BALANCE_ITEMS).to_numpy(dtype=np.float64).T
+        )
+
+        # (numerator, denominator) per ratio, divided as one (years x ratios) matrix
+        ratio_inputs = {
+            'Net Profit Margin': (net_income, total_revenue),
+            'Return on Equity (ROE)': (net_income, stockholder_equity),
+            'Return on Assets (ROA)': (net_income, total_assets),
+            'Current Ratio': (current_assets, current_liabilities),
+            'Debt to Equity': (total_liabilities, stockholder_equity),
+        }
+        # Missing and unreported inputs become 0 up front, so the guarded divide never produces a NaN to clean up
+        numerators = np.nan_to_num(np.column_stack([num for num, _ in ratio_inputs.values()]), nan=0.0, copy=False)
+        denominators = np.nan_to_num(np.column_stack([den for _, den in ratio_inputs.values()]), nan=0.0, copy=False)
+        ratio_values = _safe_div(numerators, denominators, fill=0.0)
+        ratios = pd.DataFrame(ratio_values, index=income_statement.index, columns=list(ratio_inputs), copy=False)
         
-        for df in [ratios, income_statement, balance_sheet, cash_flow]:
-            df.fillna(0, inplace=True)
+        income_statement, balance_sheet, cash_flow = (
+            _zero_filled(df) for df in (income_statement, balance_sheet, cash_flow)
+        )
         
+        return {
+            **quote,
+            "financials": {
+                "ratios": ratios, 
+                "income_statement": income_statement,
+                "balance_sheet": balance_sheet, 
+                "cash_flow": cash_flow,
+            },
+        }
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Fetches only the quote-derived screener fields (everything but "financials") for an NSE symbol.
+
+        Served from the short-lived quote cache, so callers holding day-old statements can still show a current price.
+        """
+        stock_symbol = self._to_nse_symbol(symbol)
+        try:
+            stock = (yfc or yf).Ticker(stock_symbol)
+            info = _fetch_quote(stock_symbol, int(time.time()) // _QUOTE_BUCKET_SECONDS, stock)
+        except Exception:
+            return None
+        return self._quote_fields(stock_symbol, info)
+
+    @staticmethod
+    def _quote_fields(stock_symbol: str, info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Builds the price, valuation and real-time metric fields from a quote info dict, or None without a price."""
+        if not info or ('regularMarketPrice' not in info and 'currentPrice' not in info):
+            return None
+
         ebitda = info.get('ebitda', 0)
         enterprise_value = info.get('enterpriseValue', 0)
         current_price = info.get('currentPrice', info.get('regularMarketPrice', 0))
         prev_close = info.get('previousClose', current_price)
+        # EV/EBITDA and the day's % change as one guarded division, 0 where the denominator is 0
+        ev_to_ebitda, change_percent = _safe_div(
+            np.array([enterprise_value, (current_price - prev_close) * 100], dtype=np.float64),
+            np.array([ebitda, prev_close], dtype=np.float64),
+            fill=0.0,
+        )
 
-        data = {
+        return {
             "symbol": stock_symbol, 
             "company_name": info.get('longName', 'N/A'),
             "current_price": current_price, 
             "change": current_price - prev_close,
-            "change_percent": ((current_price / prev_close) - 1) * 100 if prev_close else 0,
+            "change_percent": change_percent,
             "market_cap": info.get('marketCap', 0), 
             "book_value": info.get('bookValue', 0),
             "dividend_yield": info.get('dividendYield', 0), 
             "pe_ratio": info.get('trailingPE', 0),
-            "financials": {
-                "ratios": ratios.to_dict('records'), 
-                "income_statement": income_statement.to_dict('records'),
-                "balance_sheet": balance_sheet.to_dict('records'), 
-                "cash_flow": cash_flow.to_dict('records'),
-            },
             "real_time_metrics": {
                 "return_on_equity": info.get('returnOnEquity', 0), 
                 "debt_to_equity": info.get('debtToEquity', 0),
                 "free_cashflow": info.get('freeCashflow', 0), 
                 "enterprise_value": enterprise_value,
-                "ev_to_ebitda": enterprise_value / ebitda if ebitda else 0,
+                "ev_to_ebitda": ev_to_ebitda,
                 "fifty_two_week_high": info.get('fiftyTwoWeekHigh', 0), 
                 "fifty_two_week_low": info.get('fiftyTwoWeekLow', 0),
             }
         }
-        return data
 
-    def create_comprehensive_dashboard(self, symbol: str) -> Optional[plt.Figure]:
-        """Creates comprehensive financial charts for the given symbol."""
+    def create_comprehensive_dashboard(self, symbol: str, fig: Optional[plt.Figure] = None) -> Optional[plt.Figure]:
+        """Creates comprehensive financial charts for the given symbol, redrawing into ``fig`` when one is passed."""
         data = self.get_screener_data(symbol)
         if not data: 
             return None
+
+        # Plotting is imported here so data-only callers never pay for matplotlib/seaborn
+        from matplotlib.figure import Figure
+        self._configure_style()
             
-        CRORE = 1_00_00_000 
+        INV_CRORE = 1.0 / 1_00_00_000
         
         try:
-            df_income = pd.DataFrame(data['financials']['income_statement']).set_index('years')
-            df_bs = pd.DataFrame(data['financials']['balance_sheet']).set_index('years')
-            df_cf = pd.DataFrame(data['financials']['cash_flow']).set_index('years')
-            df_ratios = pd.DataFrame(data['financials']['ratios']).set_index('years')
+            df_income = data['financials']['income_statement']
+            df_bs = data['financials']['balance_sheet']
+            df_cf = data['financials']['cash_flow']
+            df_ratios = data['financials']['ratios']
         except (KeyError, TypeError): 
             return None
             
-        # Helper function to safely get series for plotting
-        def get_plot_series(df: pd.DataFrame, col_name: str) -> pd.Series:
-            """Returns the column as a Series for plotting, or zeros if missing."""
+        # Helper function to safely get float arrays for plotting; matplotlib takes them without unwrapping
+        def get_plot_values(df: pd.DataFrame, col_name: str, scale: float = 1.0) -> np.ndarray:
+            """Returns the column as a scaled float array for plotting, or zeros if missing."""
             if col_name in df.columns:
-                return df[col_name].fillna(0)
-            else:
-                return pd.Series(0, index=df.index, name=col_name)
+                return df[col_name].to_numpy(dtype=np.float64) * scale
+            return np.zeros(len(df))
         
-        fig, axes = plt.subplots(2, 2, figsize=(18, 12))
+        if fig is None:
+            # Built outside pyplot so the Figure never enters its global registry and is freed with its last reference
+            fig = Figure(figsize=(18, 12))
+            axes = fig.subplots(2, 2)
+        else:
+            # Reuse the caller's 2x2 Figure rather than building a new one on every refresh
+            axes = np.array(fig.axes).reshape(2, 2)
+            for ax in axes.flat:
+                ax.cla()
         fig.suptitle(f'Financial Health of {data["company_name"]}', fontsize=20, y=1.02)
         
-        for df in [df_income, df_bs, df_cf, df_ratios]: 
-            df.sort_index(inplace=True)
-        
         # Revenue and Net Income
-        revenue_series = get_plot_series(df_income, 'Total Revenue') / CRORE
-        net_income_series = get_plot_series(df_income, 'Net Income') / CRORE
+        income_years = df_income.index.to_numpy()
+        revenue = get_plot_values(df_income, 'Total Revenue', INV_CRORE)
+        net_income = get_plot_values(df_income, 'Net Income', INV_CRORE)
         
-        axes[0, 0].bar(df_income.index, revenue_series, label='Total Revenue (Cr)', color='skyblue')
-        axes[0, 0].plot(df_income.index, net_income_series, label='Net Income (Cr)', marker='o', color='crimson', linewidth=2.5)
+        axes[0, 0].bar(income_years, revenue, label='Total Revenue (Cr)', color='skyblue')
+        axes[0, 0].plot(income_years, net_income, label='Net Income (Cr)', marker='o', color='crimson', linewidth=2.5)
         axes[0, 0].set_title("Revenue & Net Income Trend")
         axes[0, 0].set_ylabel("Amount (in Cr)")
         axes[0, 0].legend()
         
         # Assets vs Liabilities
-        assets_series = get_plot_series(df_bs, 'Total Assets') / CRORE
-        liabilities_series = get_plot_series(df_bs, 'Total Liab') / CRORE
+        bs_years = df_bs.index.to_numpy()
+        assets = get_plot_values(df_bs, 'Total Assets', INV_CRORE)
+        liabilities = get_plot_values(df_bs, 'Total Liab', INV_CRORE)
         
-        axes[0, 1].plot(df_bs.index, assets_series, label='Total Assets (Cr)', marker='o', linestyle='-', color='darkgreen')
-        axes[0, 1].plot(df_bs.index, liabilities_series, label='Total Liabilities (Cr)', marker='^', linestyle='--', color='orangered')
+        axes[0, 1].plot(bs_years, assets, label='Total Assets (Cr)', marker='o', linestyle='-', color='darkgreen')
+        axes[0, 1].plot(bs_years, liabilities, label='Total Liabilities (Cr)', marker='^', linestyle='--', color='orangered')
         axes[0, 1].set_title("Assets vs. Liabilities")
         axes[0, 1].set_ylabel("Amount (in Cr)")
         axes[0, 1].legend()
         
         # Operating Cash Flow
-        op_cash_flow = get_plot_series(df_cf, 'Total Cash From Operating Activities') / CRORE
-        colors = ['salmon' if val < 0 else 'seagreen' for val in op_cash_flow]
+        op_cash_flow = get_plot_values(df_cf, 'Total Cash From Operating Activities', INV_CRORE)
+        colors = np.where(op_cash_flow < 0, 'salmon', 'seagreen')
         
-        axes[1, 0].bar(op_cash_flow.index, op_cash_flow, label='Operating Cash Flow (Cr)', color=colors)
+        axes[1, 0].bar(df_cf.index.to_numpy(), op_cash_flow, label='Operating Cash Flow (Cr)', color=colors)
         axes[1, 0].set_title("Operating Cash Flow")
         axes[1, 0].set_ylabel("Amount (in Cr)")
         axes[1, 0].axhline(0, color='black', linewidth=0.8, linestyle='--')
         axes[1, 0].legend()
         
         # Debt to Equity Ratio
-        debt_equity = get_plot_series(df_ratios, 'Debt to Equity')
-        axes[1, 1].plot(df_ratios.index, debt_equity, label='Debt-to-Equity Ratio', marker='s', color='purple')
+        debt_equity = get_plot_values(df_ratios, 'Debt to Equity')
+        axes[1, 1].plot(df_ratios.index.to_numpy(), debt_equity, label='Debt-to-Equity Ratio', marker='s', color='purple')
         axes[1, 1].set_title("Debt-to-Equity Ratio")
         axes[1, 1].set_ylabel("Ratio")
         axes[1, 1].legend()
@@ -196,5 +379,18 @@ class RealTimeFinancialDashboard:
         for ax in axes.flat: 
             ax.tick_params(axis='x', rotation=45)
             
-        plt.tight_layout(rect=[0, 0, 1, 0.98])
+        fig.tight_layout(rect=[0, 0, 1, 0.98])
         return fig
+
+@lru_cache(maxsize=256)
+def _screener_data_cached(stock_symbol: str, minute_bucket: int) -> Optional[Dict[str, Any]]:
+    """In-memory layer over the on-disk cache, shared by all instances; ``minute_bucket`` expires entries as the clock moves on."""
+    return RealTimeFinancialDashboard._compute_screener_data(stock_symbol)
+
+def _detached(data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Returns a copy of cached screener data whose dicts and frames can be modified without touching the cache."""
+    if data is None:
+        return None
+    # The statements are a few dozen cells each, so full copies are cheap next to recomputing them
+    financials = {name: df.copy() for name, df in data['financials'].items()}
+    return {**data, "financials": financials, "real_time_metrics": dict(data['real_time_metrics'])}
@@ -2,7 +2,36 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+# The cached Yahoo download layer and guarded divide are shared with the real_time backend
+from real_time import _BATCH_WORKERS, _fetch_raw, _safe_div
+
+# Output key -> stock.info key for the fields copied through as-is (missing fields default to 0)
+_QUOTE_FIELDS = {
+    "market_cap": "marketCap",
+    "book_value": "bookValue",
+    "dividend_yield": "dividendYield",
+    "pe_ratio": "trailingPE",
+}
+_METRIC_FIELDS = {
+    "return_on_equity": "returnOnEquity",
+    "debt_to_equity": "debtToEquity",
+    "free_cashflow": "freeCashflow",
+    "enterprise_value": "enterpriseValue",
+    "fifty_two_week_high": "fiftyTwoWeekHigh",
+    "fifty_two_week_low": "fiftyTwoWeekLow",
+}
+
+def _line_items(statement: pd.DataFrame, names: list, n_years: int) -> np.ndarray:
+    """Returns the named line items over the first ``n_years`` report dates, NaN where missing or unreported."""
+    rows = statement.reindex(names).to_numpy(dtype=np.float64, na_value=np.nan)[:, :n_years]
+    values = np.full((len(names), n_years), np.nan)
+    values[:, :rows.shape[1]] = rows
+    return values
 
 class RealTimeFinancialDashboard:
     """
@@ -10,140 +39,186 @@ class RealTimeFinancialDashboard:
     using the yfinance library.
     """
 
+    # The plot style is process-global, so it only needs applying by the first instance
+    _style_configured = False
+
     def __init__(self):
         """Initializes the dashboard class."""
-        # Set a professional plot style
-        sns.set_style("whitegrid")
-        plt.rcParams['figure.figsize'] = (12, 6)
-        plt.rcParams['axes.titlesize'] = 16
-        plt.rcParams['axes.labelsize'] = 12
-        plt.rcParams['xtick.labelsize'] = 10
-        plt.rcParams['ytick.labelsize'] = 10
-        plt.rcParams['legend.fontsize'] = 10
-
-    def get_screener_data(self, symbol: str) -> dict:
+        # Set a professional plot style once per process
+        if not type(self)._style_configured:
+            sns.set_style("whitegrid")
+            plt.rcParams.update({
+                'figure.figsize': (12, 6), 'axes.titlesize': 16, 'axes.labelsize': 12,
+                'xtick.labelsize': 10, 'ytick.labelsize': 10, 'legend.fontsize': 10
+            })
+            type(self)._style_configured = True
+
+    def get_screener_data_batch(self, symbols: list) -> dict:
+        """
+        Fetches comprehensive financial data for many NSE stock symbols concurrently.
+
+        Args:
+            symbols: The NSE stock symbols (e.g., ["ITC", "HDFCBANK.NS"]).
+
+        Returns:
+            A dictionary mapping each ".NS" symbol to its structured financial data.
+        """
+        ns_symbols = list(dict.fromkeys(s if s.upper().endswith('.NS') else s + '.NS' for s in symbols))
+        # Each symbol is its own set of Yahoo requests, so overlap them instead of waiting on each in turn
+        with ThreadPoolExecutor(max_workers=_BATCH_WORKERS) as executor:
+            return dict(zip(ns_symbols, executor.map(self.get_screener_data, ns_symbols)))
+
+    def _compute_frames(self, symbol: str, stock: yf.Ticker = None) -> tuple:
+        """
+        Fetches a symbol's data and builds its statements and ratios as DataFrames indexed by 'years'.
+
+        Args:
+            symbol: The NSE stock symbol, already suffixed with ".NS".
+            stock: An existing Ticker for the symbol, e.g. from get_screener_data_batch.
+
+        Returns:
+            A tuple of (info, income_statement, balance_sheet, cash_flow, ratios).
+        """
+        raw = _fetch_raw(symbol, date.today(), stock)
+        info = raw['info']
+
+        # --- Financial Statements (Annual) ---
+        # Kept in yfinance's native (line items x report dates) orientation for the ratio math
+        financials, balance, cashflow = raw['financials'], raw['balance_sheet'], raw['cashflow']
+        n_years = len(financials.columns)
+        years = pd.DatetimeIndex(financials.columns).strftime('%Y')
+
+        # --- Key Ratios ---
+        # Calculate ratios manually for consistency; balance sheet dates pair with the income statement's by position
+        # One reindex per statement; missing line items come back as NaN and end up as 0 ratios
+        net_income, total_revenue = _line_items(financials, ['Net Income', 'Total Revenue'], n_years)
+        stockholder_equity, total_assets, current_assets, current_liabilities, total_liabilities = _line_items(
+            balance, ['Total Stockholder Equity', 'Total Assets', 'Total Current Assets', 'Total Current Liabilities', 'Total Liab'], n_years
+        )
+
+        # (numerator, denominator) per ratio, divided as one (years x ratios) matrix
+        ratio_inputs = {
+            # Profitability Ratios
+            'Net Profit Margin': (net_income, total_revenue),
+            'Return on Equity (ROE)': (net_income, stockholder_equity),
+            'Return on Assets (ROA)': (net_income, total_assets),
+            # Liquidity Ratios
+            'Current Ratio': (current_assets, current_liabilities),
+            # Leverage Ratios
+            'Debt to Equity': (total_liabilities, stockholder_equity),
+        }
+        # Missing and unreported inputs become 0 up front, so the guarded divide never produces a NaN to clean up
+        numerators = np.nan_to_num(np.column_stack([num for num, _ in ratio_inputs.values()]), nan=0.0, copy=False)
+        denominators = np.nan_to_num(np.column_stack([den for _, den in ratio_inputs.values()]), nan=0.0, copy=False)
+        ratio_values = _safe_div(numerators, denominators, fill=0.0)
+        ratios = pd.DataFrame(ratio_values, index=years.rename('years'), columns=list(ratio_inputs), copy=False)
+
+        # One row per year; the year labels are formatted once and shared by every statement
+        # reported on the income statement's dates
+        def yearly(statement: pd.DataFrame) -> pd.DataFrame:
+            """Returns the statement as one zero-filled row per year, indexed by 'years'."""
+            labels = years if statement.columns.equals(financials.columns) else pd.DatetimeIndex(statement.columns).strftime('%Y')
+            values = np.nan_to_num(statement.to_numpy(dtype=np.float64, na_value=np.nan).T, nan=0.0)
+            return pd.DataFrame(values, index=labels.rename('years'), columns=statement.index)
+
+        income_statement, balance_sheet, cash_flow = (yearly(statement) for statement in (financials, balance, cashflow))
+        return info, income_statement, balance_sheet, cash_flow, ratios
+
+    def get_screener_data(self, symbol: str, stock: yf.Ticker = None) -> dict:
         """
         Fetches comprehensive financial data for a given NSE stock symbol.
 
         Args:
             symbol: The NSE stock symbol (e.g., "ITC.NS").
+            stock: An existing Ticker for the symbol, e.g. from get_screener_data_batch.
 
         Returns:
-            A dictionary containing structured financial data.
+            A dictionary containing structured financial data; each statement under "financials"
+            is a split-orient dict whose index holds the years.
         """
         if not symbol.upper().endswith('.NS'):
             symbol += '.NS'
             
-        stock = yf.Ticker(symbol)
-        info = stock.info
+        info, income_statement, balance_sheet, cash_flow, ratios = self._compute_frames(symbol, stock)
 
         # --- Basic Info ---
-        company_name = info.get('longName', 'N/A')
         current_price = info.get('currentPrice', info.get('regularMarketPrice', 0))
         previous_close = info.get('previousClose', 0)
         change = current_price - previous_close
-        change_percent = (change / previous_close) * 100 if previous_close else 0
-        market_cap = info.get('marketCap', 0)
-        book_value = info.get('bookValue', 0)
-        dividend_yield = info.get('dividendYield', 0)
-        pe_ratio = info.get('trailingPE', 0)
-        fifty_two_week_high = info.get('fiftyTwoWeekHigh', 0)
-        fifty_two_week_low = info.get('fiftyTwoWeekLow', 0)
-
-        # --- Financial Statements (Annual) ---
-        income_statement = stock.financials.transpose().reset_index()
-        balance_sheet = stock.balance_sheet.transpose().reset_index()
-        cash_flow = stock.cashflow.transpose().reset_index()
-
-        # Rename columns for clarity and format dates
-        for df in [income_statement, balance_sheet, cash_flow]:
-            df.rename(columns={'index': 'years'}, inplace=True)
-            if 'years' in df.columns:
-                df['years'] = pd.to_datetime(df['years']).dt.strftime('%Y')
-
-        # --- Key Ratios ---
-        # Calculate ratios manually for consistency
-        ratios = pd.DataFrame()
-        ratios['years'] = income_statement['years']
-        
-        # Profitability Ratios
-        ratios['Net Profit Margin'] = income_statement.get('Net Income', 0) / income_statement.get('Total Revenue', np.nan)
-        ratios['Return on Equity (ROE)'] = income_statement.get('Net Income', 0) / balance_sheet.get('Total Stockholder Equity', np.nan)
-        ratios['Return on Assets (ROA)'] = income_statement.get('Net Income', 0) / balance_sheet.get('Total Assets', np.nan)
-        
-        # Liquidity Ratios
-        ratios['Current Ratio'] = balance_sheet.get('Total Current Assets', 0) / balance_sheet.get('Total Current Liabilities', np.nan)
-        
-        # Leverage Ratios
-        ratios['Debt to Equity'] = balance_sheet.get('Total Liab', 0) / balance_sheet.get('Total Stockholder Equity', np.nan)
-        
-        # Fill NaN with 0 for cleaner tables
-        ratios.fillna(0, inplace=True)
-        income_statement.fillna(0, inplace=True)
-        balance_sheet.fillna(0, inplace=True)
-        cash_flow.fillna(0, inplace=True)
 
         # --- Real-time Metrics Calculation ---
-        ebitda = info.get('ebitda', 0)
-        enterprise_value = info.get('enterpriseValue', 0)
-        free_cashflow = info.get('freeCashflow', 0)
-        debt_to_equity_realtime = info.get('debtToEquity', 0)
-        return_on_equity_realtime = info.get('returnOnEquity', 0)
+        real_time_metrics = {target: info.get(source, 0) for target, source in _METRIC_FIELDS.items()}
+        # The day's % change and EV/EBITDA as one guarded division, 0 where the denominator is 0
+        change_percent, real_time_metrics['ev_to_ebitda'] = _safe_div(
+            np.array([change * 100, real_time_metrics['enterprise_value']], dtype=np.float64),
+            np.array([previous_close, info.get('ebitda', 0)], dtype=np.float64),
+            fill=0.0,
+        )
 
         data = {
             "symbol": symbol,
-            "company_name": company_name,
+            "company_name": info.get('longName', 'N/A'),
             "current_price": current_price,
             "change": change,
             "change_percent": change_percent,
-            "market_cap": market_cap,
-            "book_value": book_value,
-            "dividend_yield": dividend_yield,
-            "pe_ratio": pe_ratio,
+            **{target: info.get(source, 0) for target, source in _QUOTE_FIELDS.items()},
             "financials": {
-                "ratios": ratios.to_dict('records'),
-                "income_statement": income_statement.to_dict('records'),
-                "balance_sheet": balance_sheet.to_dict('records'),
-                "cash_flow": cash_flow.to_dict('records'),
+                # Split orient: one index/columns/data dict per frame, rebuilt with pd.DataFrame(**split)
+                "ratios": ratios.to_dict(orient='split'),
+                "income_statement": income_statement.to_dict(orient='split'),
+                "balance_sheet": balance_sheet.to_dict(orient='split'),
+                "cash_flow": cash_flow.to_dict(orient='split'),
             },
-            "real_time_metrics": {
-                "return_on_equity": return_on_equity_realtime,
-                "debt_to_equity": debt_to_equity_realtime,
-                "free_cashflow": free_cashflow,
-                "enterprise_value": enterprise_value,
-                "ev_to_ebitda": enterprise_value / ebitda if ebitda else 0,
-                "fifty_two_week_high": fifty_two_week_high,
-                "fifty_two_week_low": fifty_two_week_low,
-            }
+            "real_time_metrics": real_time_metrics,
         }
         return data
 
-    def create_comprehensive_dashboard(self, data: dict) -> plt.Figure:
+    def create_comprehensive_dashboard(self, data: dict, fig: plt.Figure = None) -> plt.Figure:
         """
         Creates a 2x2 dashboard of key financial charts.
 
         Args:
-            data: The processed financial data dictionary from get_screener_data.
+            data: The processed financial data dictionary from get_screener_data; its statements may be
+                split-orient dicts or already rebuilt DataFrames.
+            fig: A Figure returned by an earlier call, cleared and redrawn instead of building a new one.
 
         Returns:
             A matplotlib Figure object containing the charts.
         """
-        df_income = pd.DataFrame(data['financials']['income_statement']).set_index('years')
-        df_bs = pd.DataFrame(data['financials']['balance_sheet']).set_index('years')
-        df_cf = pd.DataFrame(data['financials']['cash_flow']).set_index('years')
-
-        fig, axes = plt.subplots(2, 2, figsize=(18, 12))
+        # Charted from the statements in ``data`` itself, so the figure always matches the tables built from it
+        df_income, df_bs, df_cf, df_ratios = (
+            frame if isinstance(frame, pd.DataFrame) else pd.DataFrame(**frame)
+            for frame in (data['financials'][name] for name in ('income_statement', 'balance_sheet', 'cash_flow', 'ratios'))
+        )
+
+        if fig is None:
+            # Built outside pyplot so the Figure never enters its global registry and is freed with its last reference
+            fig = Figure(figsize=(18, 12))
+            axes = fig.subplots(2, 2)
+        else:
+            # Reuse the caller's 2x2 Figure rather than building a new one on every refresh
+            axes = np.array(fig.axes).reshape(2, 2)
+            for ax in axes.flat:
+                ax.cla()
         fig.suptitle(f'Financial Health of {data["company_name"]}', fontsize=20, y=1.02)
         
-        # Sort index to ensure correct plotting order
-        df_income.sort_index(inplace=True)
-        df_bs.sort_index(inplace=True)
-        df_cf.sort_index(inplace=True)
+        # Sort the income statement's years once and line up every statement reported on the same dates with it;
+        # positions rather than labels, since two reports can fall in the same year after a fiscal year-end change
+        shared_years = df_income.index
+        pos = np.argsort(shared_years.to_numpy(), kind='stable')
+        df_income, df_bs, df_cf, df_ratios = (
+            df.iloc[pos] if df.index.equals(shared_years) else df.sort_index(kind='stable')
+            for df in (df_income, df_bs, df_cf, df_ratios)
+        )
+
+        # Plain arrays up front so matplotlib doesn't unwrap a Series on every call
+        inv_crore = 1 / 1e7
+        income_years, bs_years, cf_years = (df.index.to_numpy() for df in (df_income, df_bs, df_cf))
 
         # 1. Revenue and Net Income
         ax1 = axes[0, 0]
-        ax1.bar(df_income.index, df_income['Total Revenue'] / 1e7, label='Total Revenue (Cr)', color=sns.color_palette("viridis", 2)[0])
-        ax1.plot(df_income.index, df_income['Net Income'] / 1e7, label='Net Income (Cr)', marker='o', color='red', linewidth=2)
+        ax1.bar(income_years, df_income['Total Revenue'].to_numpy() * inv_crore, label='Total Revenue (Cr)', color=sns.color_palette("viridis", 2)[0])
+        ax1.plot(income_years, df_income['Net Income'].to_numpy() * inv_crore, label='Net Income (Cr)', marker='o', color='red', linewidth=2)
         ax1.set_title("Revenue & Net Income Trend")
         ax1.set_ylabel("Amount (in Cr)")
         ax1.legend()
@@ -151,8 +226,8 @@ class RealTimeFinancialDashboard:
 
         # 2. Assets vs. Liabilities
         ax2 = axes[0, 1]
-        ax2.plot(df_bs.index, df_bs['Total Assets'] / 1e7, label='Total Assets (Cr)', marker='o', linestyle='-', color=sns.color_palette("magma", 2)[0])
-        ax2.plot(df_bs.index, df_bs['Total Liab'] / 1e7, label='Total Liabilities (Cr)', marker='^', linestyle='--', color=sns.color_palette("magma", 2)[1])
+        ax2.plot(bs_years, df_bs['Total Assets'].to_numpy() * inv_crore, label='Total Assets (Cr)', marker='o', linestyle='-', color=sns.color_palette("magma", 2)[0])
+        ax2.plot(bs_years, df_bs['Total Liab'].to_numpy() * inv_crore, label='Total Liabilities (Cr)', marker='^', linestyle='--', color=sns.color_palette("magma", 2)[1])
         ax2.set_title("Assets vs. Liabilities")
         ax2.set_ylabel("Amount (in Cr)")
         ax2.legend()
@@ -160,22 +235,20 @@ class RealTimeFinancialDashboard:
 
         # 3. Cash Flow from Operations
         ax3 = axes[1, 0]
-        ax3.bar(df_cf.index, df_cf['Total Cash From Operating Activities'] / 1e7, label='Operating Cash Flow (Cr)', color=sns.color_palette("coolwarm", 1))
+        ax3.bar(cf_years, df_cf['Total Cash From Operating Activities'].to_numpy() * inv_crore, label='Operating Cash Flow (Cr)', color=sns.color_palette("coolwarm", 1))
         ax3.set_title("Operating Cash Flow")
         ax3.set_ylabel("Amount (in Cr)")
         ax3.axhline(0, color='black', linewidth=0.8, linestyle='--')
         ax3.tick_params(axis='x', rotation=45)
 
-        # 4. Debt to Equity Ratio
+        # 4. Debt to Equity Ratio, already computed alongside the other ratios
         ax4 = axes[1, 1]
-        debt_to_equity = df_bs.get('Total Liab', 0) / df_bs.get('Total Stockholder Equity', np.nan)
-        debt_to_equity.fillna(0, inplace=True)
-        ax4.plot(debt_to_equity.index, debt_to_equity, label='Debt-to-Equity Ratio', marker='s', color='purple')
+        ax4.plot(df_ratios.index.to_numpy(), df_ratios['Debt to Equity'].to_numpy(), label='Debt-to-Equity Ratio', marker='s', color='purple')
         ax4.set_title("Debt-to-Equity Ratio")
         ax4.set_ylabel("Ratio")
         ax4.legend()
         ax4.tick_params(axis='x', rotation=45)
 
-        plt.tight_layout(rect=[0, 0, 1, 0.98])
+        fig.tight_layout(rect=[0, 0, 1, 0.98])
         return fig
 
@@ -2,46 +2,72 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 from real_time import RealTimeFinancialDashboard
+from dashboard_ui import get_dashboard, chart_axes
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+import json
 import warnings
 
 warnings.filterwarnings("ignore")
 
+# Decimal places shown in the grids' numeric columns
+_GRID_DECIMALS = 2
+
+@st.cache_data(show_spinner=False)
+def _csv_bytes(symbol: str, name: str, df: pd.DataFrame) -> bytes:
+    """Encodes a statement, one column per year, as CSV bytes once instead of on every rerun."""
+    return df.transpose().to_csv().encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _grid_options(columns: tuple, _df: pd.DataFrame) -> dict:
+    """Builds the AgGrid options once per column layout; ``_df`` only supplies the dtypes and is not hashed."""
+    gb = GridOptionsBuilder.from_dataframe(_df)
+    gb.configure_selection('single', use_checkbox=True)
+    gb.configure_column("Metric", headerName="Metric", flex=2, minWidth=250)
+    for col in columns[1:]:
+         gb.configure_column(col, type=["numericColumn", "numberColumnFilter", "customNumericFormat"], precision=_GRID_DECIMALS, flex=1, minWidth=120)
+    # The builder nests defaultdicts with a local factory; round-trip to plain dicts so the result can be cached
+    return json.loads(json.dumps(gb.build()))
+
+@st.cache_data(show_spinner=False)
+def _precompute_all(symbol: str, financials: dict) -> dict:
+    """Builds every per-tab table artifact for a symbol once: grid frame, Metric-indexed view, grid options and CSV bytes."""
+    artifacts = {}
+    for name in ('ratios', 'income_statement', 'balance_sheet', 'cash_flow'):
+        df = financials[name]
+        # Keep the Metric-indexed view so the chart can look up the selected row by label
+        df_indexed = df.transpose()
+        # The grid only shows _GRID_DECIMALS places, so ship no more digits than that to the browser
+        df_transposed = df_indexed.round(_GRID_DECIMALS).reset_index().rename(columns={'index': 'Metric'})
+        artifacts[name] = {
+            "indexed": df_indexed,
+            "grid": df_transposed,
+            "grid_options": _grid_options(tuple(df_transposed.columns), df_transposed),
+            "csv": _csv_bytes(symbol, name, df.reset_index()),
+        }
+    return artifacts
+
 # --- Helper Function for DRY Principle ---
-def display_financial_table_and_chart(title: str, df: pd.DataFrame, y_label: str = "Value"):
+def display_financial_table_and_chart(title: str, artifact: dict, y_label: str = "Value"):
     """
     Displays an interactive AgGrid table and a corresponding bar chart for a selected row.
     This function helps avoid repeating code across multiple tabs.
 
     Args:
         title (str): The subheader title for the section.
-        df (pd.DataFrame): The dataframe to display. Must contain a 'years' column.
+        artifact (dict): The statement's precomputed tables from _precompute_all.
         y_label (str): The label for the y-axis of the chart.
     """
     st.subheader(title)
-    
-    # Prepare the dataframe for display
-    df_display = df.copy()
-    df_display.set_index('years', inplace=True)
-    df_transposed = df_display.transpose().reset_index().rename(columns={'index': 'Metric'})
-
-    # Configure the interactive grid
-    gb = GridOptionsBuilder.from_dataframe(df_transposed)
-    gb.configure_selection('single', use_checkbox=True)
-    gb.configure_column("Metric", headerName="Metric", flex=2, minWidth=250)
-    for col in df_transposed.columns[1:]:
-         gb.configure_column(col, type=["numericColumn", "numberColumnFilter", "customNumericFormat"], flex=1, minWidth=120)
-    
-    grid_options = gb.build()
-    
+    df_indexed, df_transposed = artifact["indexed"], artifact["grid"]
+
     grid_response = AgGrid(
         df_transposed,
-        gridOptions=grid_options,
+        # AgGrid writes into the options it is given, so keep the stored copy pristine
+        gridOptions=dict(artifact["grid_options"]),
         update_mode=GridUpdateMode.SELECTION_CHANGED,
         theme='streamlit',
         allow_unsafe_jscode=True,
-        height=500,
-        fit_columns_on_grid_load=True
+        height=500
     )
 
     # Plot chart for the selected row
@@ -50,17 +76,17 @@ def display_financial_table_and_chart(title: str, df: pd.DataFrame, y_label: str
         metric = selected_row['Metric']
         st.subheader(f"📉 Chart: {metric} over Years")
         
-        fig, ax = plt.subplots(figsize=(10, 4))
+        fig, ax = chart_axes(f"chart_fig::{title}", (10, 4))
         
         # Prepare data for plotting (ensure it's numeric)
-        plot_data = pd.to_numeric(df_transposed[df_transposed['Metric'] == metric].iloc[0, 1:], errors='coerce')
+        plot_data = pd.to_numeric(df_indexed.loc[metric], errors='coerce')
         plot_data.plot(kind='bar', ax=ax, color='skyblue')
         
         ax.set_ylabel(y_label)
         ax.set_xlabel("Year")
         ax.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        fig.tight_layout()
         st.pyplot(fig)
 
 
@@ -68,7 +94,7 @@ def display_financial_table_and_chart(title: str, df: pd.DataFrame, y_label: str
 
 # Initialize the dashboard class
 try:
-    dashboard = RealTimeFinancialDashboard()
+    dashboard = get_dashboard(RealTimeFinancialDashboard)
 except Exception as e:
     st.error(f"Failed to initialize the dashboard backend: {e}")
     st.stop()
@@ -83,26 +109,33 @@ symbol_input = st.sidebar.text_input("Enter NSE Symbol (e.g., ITC, HDFCBANK):",
 run_dashboard = st.sidebar.button("Generate Dashboard")
 
 if run_dashboard and symbol_input:
+    symbol = symbol_input.upper()
     with st.spinner(f"Fetching and processing data for {symbol_input}..."):
         try:
-            data = dashboard.get_screener_data(symbol_input.upper())
+            data = dashboard.get_screener_data(symbol)
             if not data or "financials" not in data:
                 raise ValueError("Empty or invalid data received from live source.")
         except Exception as e:
-            st.error(f"❌ Error while fetching data for {symbol_input.upper()}: {str(e)}")
+            st.error(f"❌ Error while fetching data for {symbol}: {str(e)}")
             st.stop()
 
-    # --- Data Preparation (CRITICAL FIX) ---
-    # Define dataframes here to make them available to both tabs and the export section
-    try:
-        df_ratios = pd.DataFrame(data['financials']['ratios'])
-        df_income = pd.DataFrame(data['financials']['income_statement'])
-        df_bs = pd.DataFrame(data['financials']['balance_sheet'])
-        df_cf = pd.DataFrame(data['financials']['cash_flow'])
-    except KeyError as e:
-        st.error(f"Data structure is missing a required key: {e}. Cannot build dashboard.")
-        st.stop()
+        # Specialize the session on this fetch: every per-tab artifact is built once here (memoized on the
+        # financials themselves), so reruns from grid selections and tab switches only look them up
+        try:
+            artifacts = _precompute_all(data['symbol'], data['financials'])
+        except KeyError as e:
+            st.error(f"Data structure is missing a required key: {e}. Cannot build dashboard.")
+            st.stop()
+        st.session_state['data'] = data
+        st.session_state['current_symbol'] = symbol
+        st.session_state['artifacts'] = artifacts
+        # New data, so the summary figure is redrawn on the next pass through the Charts tab
+        st.session_state.pop('summary_symbol', None)
 
+if st.session_state.get('artifacts'):
+    data = st.session_state['data']
+    symbol = st.session_state['current_symbol']
+    arts = st.session_state['artifacts']
 
     # --- Header and Price Info ---
     st.markdown(f"## {data.get('company_name', 'N/A')} ({data.get('symbol', 'N/A')})")
@@ -119,7 +152,7 @@ if run_dashboard and symbol_input:
     with tab1:
         display_financial_table_and_chart(
             title="📊 Key Ratios",
-            df=df_ratios,
+            artifact=arts['ratios'],
             y_label="Value"
         )
 
@@ -127,7 +160,7 @@ if run_dashboard and symbol_input:
     with tab2:
         display_financial_table_and_chart(
             title="💰 Income Statement",
-            df=df_income,
+            artifact=arts['income_statement'],
             y_label="₹ in Cr"
         )
 
@@ -135,7 +168,7 @@ if run_dashboard and symbol_input:
     with tab3:
         display_financial_table_and_chart(
             title="📘 Balance Sheet",
-            df=df_bs,
+            artifact=arts['balance_sheet'],
             y_label="₹ in Cr"
         )
 
@@ -143,7 +176,7 @@ if run_dashboard and symbol_input:
     with tab4:
         display_financial_table_and_chart(
             title="💵 Cash Flow Statement",
-            df=df_cf,
+            artifact=arts['cash_flow'],
             y_label="₹ in Cr"
         )
 
@@ -152,7 +185,11 @@ if run_dashboard and symbol_input:
         st.subheader("📈 Financial Charts")
         try:
             # BUG FIX: The returned figure must be displayed
-            fig = dashboard.create_comprehensive_dashboard(symbol_input.upper())
+            # One summary Figure per session, redrawn only after a new fetch
+            fig = st.session_state.get('summary_fig')
+            if st.session_state.get('summary_symbol') != symbol:
+                fig = dashboard.create_comprehensive_dashboard(symbol, fig=fig)
+                st.session_state.summary_fig, st.session_state.summary_symbol = fig, symbol
             if fig:
                  st.pyplot(fig) # Display the figure
             else:
@@ -186,26 +223,26 @@ if run_dashboard and symbol_input:
     with st.expander("📥 Export Options"):
         st.download_button(
             label="Download Income Statement (CSV)",
-            data=df_income.transpose().to_csv().encode('utf-8'),
-            file_name=f"{symbol_input.upper()}_Income_Statement.csv",
+            data=arts['income_statement']['csv'],
+            file_name=f"{symbol}_Income_Statement.csv",
             mime='text/csv'
         )
         st.download_button(
             label="Download Balance Sheet (CSV)",
-            data=df_bs.transpose().to_csv().encode('utf-8'),
-            file_name=f"{symbol_input.upper()}_Balance_Sheet.csv",
+            data=arts['balance_sheet']['csv'],
+            file_name=f"{symbol}_Balance_Sheet.csv",
             mime='text/csv'
         )
         st.download_button(
             label="Download Cash Flow (CSV)",
-            data=df_cf.transpose().to_csv().encode('utf-8'),
-            file_name=f"{symbol_input.upper()}_Cash_Flow.csv",
+            data=arts['cash_flow']['csv'],
+            file_name=f"{symbol}_Cash_Flow.csv",
             mime='text/csv'
         )
         st.download_button(
             label="Download Key Ratios (CSV)",
-            data=df_ratios.transpose().to_csv().encode('utf-8'),
-            file_name=f"{symbol_input.upper()}_Key_Ratios.csv",
+            data=arts['ratios']['csv'],
+            file_name=f"{symbol}_Key_Ratios.csv",
             mime='text/csv'
         )
 
@@ -8,9 +8,10 @@ import warnings
 warnings.filterwarnings("ignore")
 
 from RealTimeFinancialDashboard import RealTimeFinancialDashboard
+from dashboard_ui import get_dashboard
 
 # Initialize the dashboard class
-dashboard = RealTimeFinancialDashboard()
+dashboard = get_dashboard(RealTimeFinancialDashboard)
 
 # Streamlit UI setup
 st.set_page_config(page_title="TIKR-Style Financial Dashboard", layout="wide")